@@ -1,13 +1,26 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Generic, Hashable, Iterator, Protocol, Set, TypeVar
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    TypeVar,
+)
 
 from .sorted_collection import SortedCollection
 
 IndexableT = TypeVar("IndexableT", bound="Indexable")
 HashableT = TypeVar("HashableT", bound=Hashable)
 
+EMPTY: FrozenSet = frozenset()
+
 
 class Indexable(Hashable, Protocol):
     def __lt__(self: IndexableT, other: IndexableT) -> bool:
@@ -16,32 +29,56 @@ class Indexable(Hashable, Protocol):
 
 class ColumnIndex(Generic[HashableT]):
     def __init__(self) -> None:
-        self._index: defaultdict[Indexable, Set[HashableT]] = defaultdict(set)
-        self._sorted_values: SortedCollection[Indexable] = SortedCollection()
+        self._index: Dict[Indexable, Set[HashableT]] = dict()
+        # Only built once sorted items are requested, so that columns
+        # which are never sorted do not pay for keeping values in order.
+        self._sorted_values: Optional[SortedCollection[Indexable]] = None
+        # All ids ordered by their key, built on demand and dropped
+        # whenever the index changes.
+        self._sorted_items: Optional[List[HashableT]] = None
 
     def get_sorted_items(
         self,
         *,
         reverse: bool = False,
-    ) -> Iterator[Hashable]:
+    ) -> Iterator[HashableT]:
+        items = self._sorted_items
+        if items is None:
+            sorted_values = self._sorted_values
+            if sorted_values is None:
+                sorted_values = self._sorted_values = SortedCollection()
+                for value in sorted(self._index):
+                    sorted_values.add(value)
+            index = self._index
+            items = self._sorted_items = [
+                id_ for value in sorted_values for id_ in index[value]
+            ]
         if reverse:
-            keys = self._sorted_values.reverse()
-        else:
-            keys = iter(self._sorted_values)
-        for value in keys:
-            yield from self._index[value]
+            return reversed(items)
+        return iter(items)
 
     def remove_item(self, key: Indexable, id_: HashableT) -> None:
         """Remove an item from the index"""
         ids = self._index[key]
         ids.remove(id_)
+        self._sorted_items = None
         if not ids:
-            self._sorted_values.remove(key)
+            del self._index[key]
+            if self._sorted_values is not None:
+                self._sorted_values.remove(key)
 
     def add_item(self, key: Indexable, id_: HashableT) -> None:
         """Add an item to the index"""
-        self._index[key].add(id_)
-        self._sorted_values.add(key)
+        ids = self._index.get(key)
+        if ids is None:
+            ids = self._index[key] = set()
+            if self._sorted_values is not None:
+                self._sorted_values.add(key)
+        ids.add(id_)
+        self._sorted_items = None
 
-    def __getitem__(self, key: Indexable) -> Set[HashableT]:
-        return self._index[key]
+    def __getitem__(self, key: Indexable) -> AbstractSet[HashableT]:
+        """Return the ids stored under key. Looking up a key that was
+        never added does not create an entry in the index.
+        """
+        return self._index.get(key, EMPTY)
@@ -1,5 +1,5 @@
-from bisect import insort
-from typing import Generic, Hashable, Iterator, List, Optional, Protocol, Set, TypeVar
+from bisect import bisect_left, insort
+from typing import Generic, Hashable, Iterator, List, Protocol, Set, TypeVar
 
 T = TypeVar("T", bound="Comparable")
 
@@ -24,29 +24,11 @@ class SortedCollection(Generic[T]):
 
     def remove(self, item: T) -> None:
         if item in self._items_set:
-            index = bisect_find(self._items_list, item)
-            if index is not None:
-                del self._items_list[index]
+            del self._items_list[bisect_left(self._items_list, item)]
             self._items_set.remove(item)
 
     def reverse(self) -> Iterator[T]:
-        yield from reversed(self._items_list)
+        return reversed(self._items_list)
 
     def __iter__(self) -> Iterator[T]:
-        yield from self._items_list
-
-
-def bisect_find(items: List[T], x: T) -> Optional[int]:
-    start = 0
-    stop = len(items)
-    while True:
-        if start == stop:
-            if items[start] == x:
-                return start
-            else:
-                return None
-        middle = start + stop // 2
-        if items[middle] < x:
-            start = middle + 1
-        else:
-            stop = middle
+        return iter(self._items_list)
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import fields
+from operator import attrgetter
 from typing import (
+    AbstractSet,
     Any,
+    Callable,
     Dict,
     Generic,
     Hashable,
+    Iterable,
     Iterator,
+    KeysView,
     List,
     Optional,
     Protocol,
     Set,
+    Tuple,
     Type,
     TypeVar,
 )
@@ -28,7 +34,7 @@ Row = TypeVar("Row", bound=HasId)
 
 
 class Table(Generic[Row]):
-    __slots__ = ("rows", "all_items", "column_indices")
+    __slots__ = ("rows", "column_indices", "revision", "_indices")
 
     def __init__(
         self, cls: Type[Row], no_index_fields: Optional[List[str]] = None
@@ -41,12 +47,24 @@ class Table(Generic[Row]):
         blacklist.add("id")
         indexed_columns: Set[str] = {field.name for field in fields(cls)} - blacklist
         self.rows: Dict[Hashable, Any] = dict()
-        self.all_items: Set[Hashable] = set()
         self.column_indices: Dict[str, ColumnIndex] = {
             field: ColumnIndex() for field in indexed_columns
         }
+        self._indices: Tuple[Tuple[Callable[[Any], Any], ColumnIndex], ...] = tuple(
+            (attrgetter(column), index) for column, index in self.column_indices.items()
+        )
+        # Incremented on every change to the table so that callers can
+        # tell whether results they derived from it are still valid.
+        self.revision: int = 0
 
-    def get_row_by_index_column(self, column: str, value: Indexable) -> Set[Hashable]:
+    @property
+    def all_items(self) -> KeysView[Hashable]:
+        """A live view of the ids of all rows in the table."""
+        return self.rows.keys()
+
+    def get_row_by_index_column(
+        self, column: str, value: Indexable
+    ) -> AbstractSet[Hashable]:
         """Get all ids where the row has a specific value in the
         specified column.
         """
@@ -62,10 +80,29 @@ class Table(Generic[Row]):
         if id_ in self.rows:
             raise ValueError(f"Row with id {id_} is already present in table")
         self.rows[id_] = row
-        self.all_items.add(id_)
-        for column in self.column_indices:
-            column_value = getattr(row, column)
-            self.column_indices[column].add_item(column_value, id_)
+        self.revision += 1
+        for get_value, index in self._indices:
+            index.add_item(get_value(row), id_)
+
+    def add_rows(self, rows: Iterable[Row]) -> None:
+        """Add multiple rows to the table. If any of the ids is already
+        in the table or appears more than once in rows, a ValueError
+        is raised and the table is left unchanged.
+        """
+        rows = list(rows)
+        new_rows: Dict[Hashable, Row] = {row.id: row for row in rows}
+        if len(new_rows) != len(rows):
+            raise ValueError("Rows with the same id were given more than once")
+        if not self.rows.keys().isdisjoint(new_rows):
+            duplicates = self.rows.keys() & new_rows.keys()
+            raise ValueError(f"Rows with ids {duplicates} are already present in table")
+        if not new_rows:
+            return
+        self.rows.update(new_rows)
+        self.revision += 1
+        for get_value, index in self._indices:
+            for id_, row in new_rows.items():
+                index.add_item(get_value(row), id_)
 
     def update_row(self, id_: Hashable, **values: Any) -> None:
         """All keyword arguments except id_ must be field names of of
@@ -79,13 +116,18 @@ class Table(Generic[Row]):
         row = self.rows.get(id_)
         if row is None:
             return
+        self.revision += 1
+        column_indices = self.column_indices
         for column, value in values.items():
+            # Reading the old value first makes unknown column names
+            # raise an AttributeError instead of adding a new attribute.
             old_value = getattr(row, column)
             setattr(row, column, value)
-            if column not in self.column_indices:
+            index = column_indices.get(column)
+            if index is None or old_value == value:
                 continue
-            self.column_indices[column].remove_item(old_value, id_)
-            self.column_indices[column].add_item(value, id_)
+            index.remove_item(old_value, id_)
+            index.add_item(value, id_)
 
     def delete_row(self, id_: Hashable) -> Optional[Row]:
         """The dataclass instance stored in that row will be returned.
@@ -94,10 +136,10 @@ class Table(Generic[Row]):
         row = self.rows.get(id_)
         if row is None:
             return None
-        for column in self.column_indices:
-            self.column_indices[column].remove_item(getattr(row, column), id_)
-        self.all_items.remove(id_)
+        for get_value, index in self._indices:
+            index.remove_item(get_value(row), id_)
         del self.rows[id_]
+        self.revision += 1
         return row
 
     def get_rows_sorted_by_column(
@@ -5,7 +5,20 @@ class to construct a database that "lives" on the heap/in RAM.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Iterator, Optional, Set, TypeVar, cast
+from operator import attrgetter
+from typing import (
+    AbstractSet,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 from unittest import TestCase
 from uuid import UUID, uuid4
 
@@ -42,6 +55,47 @@ class Tests(TestCase):
         assert self.db.get_users().from_district(expected_district)
         assert not self.db.get_users().from_district("other_district")
 
+    def test_can_filter_users_by_name_and_district(self) -> None:
+        addresses = [
+            self.db.create_address(street="", district="berlin") for _ in range(3)
+        ]
+        other_address = self.db.create_address(street="", district="other")
+        for address in addresses:
+            self.db.create_user(name="", address=address.id)
+        expected_user = self.db.create_user(name="name", address=addresses[0].id)
+        self.db.create_user(name="name", address=other_address.id)
+        assert list(self.db.get_users().with_name("name").from_district("berlin")) == [
+            expected_user
+        ]
+
+    def test_can_filter_users_by_name_and_district_with_cached_district(
+        self,
+    ) -> None:
+        addresses = [
+            self.db.create_address(street="", district="berlin") for _ in range(3)
+        ]
+        expected_user = self.db.create_user(name="name", address=addresses[0].id)
+        self.db.create_user(name="", address=addresses[1].id)
+        assert len(self.db.get_users().from_district("berlin")) == 2
+        assert self.db.has_cached_users_in_district("berlin")
+        assert list(self.db.get_users().with_name("name").from_district("berlin")) == [
+            expected_user
+        ]
+
+    def test_users_from_district_include_users_created_after_first_query(
+        self,
+    ) -> None:
+        address = self.db.create_address(street="", district="berlin")
+        self.db.create_user(name="", address=address.id)
+        assert len(self.db.get_users().from_district("berlin")) == 1
+        self.db.create_user(name="", address=address.id)
+        assert len(self.db.get_users().from_district("berlin")) == 2
+
+    def test_can_check_whether_id_is_in_address_ids(self) -> None:
+        address = self.db.create_address(street="", district="berlin")
+        assert address.id in self.db.get_addresses().in_district("berlin").ids()
+        assert address.id not in self.db.get_addresses().in_district("other").ids()
+
     def test_can_filter_addresses_by_district(self) -> None:
         self.db.create_address(street="", district="berlin")
         assert self.db.get_addresses().in_district("berlin")
@@ -65,6 +119,16 @@ class Tests(TestCase):
         self.db.get_users().increase_login_count()
         assert all([user.login_counter == 1 for user in self.db.get_users()])
 
+    def test_can_create_addresses_in_bulk(self) -> None:
+        self.db.create_addresses([("a", "berlin"), ("b", "berlin"), ("c", "other")])
+        assert len(self.db.get_addresses().in_district("berlin")) == 2
+
+    def test_can_create_users_in_bulk(self) -> None:
+        address = self.db.create_address(street="", district="berlin")
+        self.db.create_users([("a", address.id), ("b", address.id)])
+        assert len(self.db.get_users().from_district("berlin")) == 2
+        assert self.db.get_users().with_name("b")
+
     def test_can_delete_user(self) -> None:
         address = self.db.create_address(street="", district="")
         self.db.create_user(name="delete me", address=address.id)
@@ -74,6 +138,21 @@ class Tests(TestCase):
         assert len(self.db.get_users()) == 1
         assert not self.db.get_users().with_name("delete me")
 
+    def test_can_delete_all_users(self) -> None:
+        address = self.db.create_address(street="", district="")
+        self.db.create_user(name="", address=address.id)
+        self.db.create_user(name="", address=address.id)
+        deleted_rows = self.db.get_users().delete()
+        assert deleted_rows == 2
+        assert not self.db.get_users()
+
+    def test_query_reflects_users_created_after_it_was_evaluated(self) -> None:
+        address = self.db.create_address(street="", district="")
+        query = self.db.get_users().with_name("name")
+        assert not query
+        self.db.create_user(name="name", address=address.id)
+        assert len(query) == 1
+
     def test_can_order_users_by_name(self) -> None:
         expected_names = ["a", "c", "e", "b", "a"]
         address = self.db.create_address(street="", district="")
@@ -92,6 +171,19 @@ class Tests(TestCase):
             user.name for user in self.db.get_users().ordered_by_name(reverse=True)
         ] == sorted(expected_names, reverse=True)
 
+    def test_can_order_small_selection_of_users_by_name(self) -> None:
+        expected_names = ["a", "c", "e", "b", "a"]
+        address = self.db.create_address(street="", district="berlin")
+        other_address = self.db.create_address(street="", district="other")
+        for name in expected_names:
+            self.db.create_user(name=name, address=address.id)
+        for _ in range(100):
+            self.db.create_user(name="", address=other_address.id)
+        assert [
+            user.name
+            for user in self.db.get_users().from_district("berlin").ordered_by_name()
+        ] == sorted(expected_names)
+
 
 @dataclass(slots=True)
 class Address:
@@ -114,6 +206,12 @@ class Database:
         default_factory=lambda: Table(cls=User, no_index_fields=["login_counter"])
     )
     addresses: Table = field(default_factory=lambda: Table(cls=Address))
+    _district_users: Dict[str, AbstractSet[UUID]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _district_users_revision: Optional[Tuple[int, int]] = field(
+        default=None, init=False, repr=False
+    )
 
     def create_address(self, *, street: str, district: str) -> Address:
         item = Address(
@@ -123,6 +221,14 @@ class Database:
         self.addresses.add_row(row=item)
         return item
 
+    def create_addresses(self, addresses: Iterable[Tuple[str, str]]) -> List[Address]:
+        """Create one address per (street, district) pair."""
+        created = [
+            Address(street=street, district=district) for street, district in addresses
+        ]
+        self.addresses.add_rows(created)
+        return created
+
     def create_user(self, *, name: str, address: UUID) -> User:
         user = User(
             name=name,
@@ -131,20 +237,62 @@ class Database:
         self.users.add_row(row=user)
         return user
 
+    def create_users(self, users: Iterable[Tuple[str, UUID]]) -> List[User]:
+        """Create one user per (name, address) pair."""
+        created = [User(name=name, address=address) for name, address in users]
+        self.users.add_rows(created)
+        return created
+
+    def revision(self) -> Tuple[int, int]:
+        return self.users.revision, self.addresses.revision
+
+    def has_cached_users_in_district(self, district: str) -> bool:
+        return (
+            self._district_users_revision == self.revision()
+            and district in self._district_users
+        )
+
+    def users_in_district(self, district: str) -> AbstractSet[UUID]:
+        """Ids of all users living in district. The results are kept
+        until one of the tables is changed.
+        """
+        revision = self.revision()
+        if revision != self._district_users_revision:
+            self._district_users.clear()
+            self._district_users_revision = revision
+        users = self._district_users.get(district)
+        if users is None:
+            addresses = cast(
+                AbstractSet[UUID],
+                self.addresses.get_row_by_index_column("district", district),
+            )
+            users = self._district_users[district] = cast(
+                AbstractSet[UUID],
+                set().union(
+                    *(
+                        self.users.get_row_by_index_column("address", address)
+                        for address in addresses
+                    )
+                ),
+            )
+        return users
+
     def get_addresses(self) -> AddressQuery:
         return AddressQuery(
-            items=lambda: cast(Set[UUID], self.addresses.all_items),
+            items=cast(Callable[[], AbstractSet[UUID]], self.addresses.rows.keys),
             db=self,
             ordering=None,
         )
 
     def get_users(self) -> UserQuery:
         return UserQuery(
-            items=lambda: cast(Set[UUID], self.users.all_items), db=self, ordering=None
+            items=cast(Callable[[], AbstractSet[UUID]], self.users.rows.keys),
+            db=self,
+            ordering=None,
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Ordering:
     column: str
     table: str
@@ -153,17 +301,41 @@ class Ordering:
 
 class UUIDQuery:
     def __init__(
-        self, items: Callable[[], Set[UUID]], db: Database, ordering: Optional[Ordering]
+        self,
+        items: Callable[[], AbstractSet[UUID]],
+        db: Database,
+        ordering: Optional[Ordering],
     ):
         self._items = items
         self.db = db
         self.ordering = ordering
+        self._cached_items: Optional[AbstractSet[UUID]] = None
+        self._cached_revision: Optional[Tuple[int, int]] = None
+
+    def _materialize(self) -> AbstractSet[UUID]:
+        """Evaluate the filters of this query. The result is reused
+        until one of the tables in the database is changed.
+        """
+        revision = self.db.revision()
+        if self._cached_items is None or self._cached_revision != revision:
+            self._cached_items = self._items()
+            self._cached_revision = revision
+        return self._cached_items
+
+    def _restrict(self, ids: AbstractSet[UUID]) -> AbstractSet[UUID]:
+        """Intersect the result of this query with ids, which must all
+        be ids of rows in the queried table.
+        """
+        items = self._materialize()
+        if isinstance(items, KeysView):
+            # items holds every row of the table, so all of ids match.
+            # Copying the set avoids rehashing the UUIDs.
+            return set(ids)
+        return items & ids
 
     def with_id(self: UUIDQueryT, id_: UUID) -> UUIDQueryT:
-        def new_items():
-            return self._items() & {
-                id_,
-            }
+        def new_items() -> AbstractSet[UUID]:
+            return {id_} if id_ in self._materialize() else set()
 
         return type(self)(
             items=new_items,
@@ -173,8 +345,18 @@ class UUIDQuery:
 
     def _get_ordered_items(self) -> Iterator[UUID]:
         if self.ordering:
-            items = self._items()
+            items = self._materialize()
             table = getattr(self.db, self.ordering.table)
+            if len(items) * 4 < len(table.rows):
+                # For small selections sorting the selected rows is
+                # cheaper than walking the whole column index.
+                get_value = attrgetter(self.ordering.column)
+                yield from sorted(
+                    items,
+                    key=lambda item: get_value(table[item]),
+                    reverse=self.ordering.reverse,
+                )
+                return
             yield from (
                 item
                 for item in table.get_rows_sorted_by_column(
@@ -184,10 +366,10 @@ class UUIDQuery:
                 if item in items
             )
         else:
-            yield from self._items()
+            yield from self._materialize()
 
     def __len__(self) -> int:
-        return len(self._items())
+        return len(self._materialize())
 
 
 class UserQuery(UUIDQuery):
@@ -195,8 +377,9 @@ class UserQuery(UUIDQuery):
         yield from (self.db.users[item] for item in self._get_ordered_items())
 
     def with_name(self, name: str) -> UserQuery:
-        def new_items() -> Set[UUID]:
-            return self._items() & self.db.users.get_row_by_index_column("name", name)
+        def new_items() -> AbstractSet[UUID]:
+            ids = self.db.users.get_row_by_index_column("name", name)
+            return self._restrict(cast(AbstractSet[UUID], ids))
 
         return type(self)(
             items=new_items,
@@ -205,17 +388,23 @@ class UserQuery(UUIDQuery):
         )
 
     def from_district(self, district: str) -> UserQuery:
-        def new_items() -> Set[UUID]:
-            addresses = set(self.db.get_addresses().in_district(district).ids())
-            results: Set[UUID] = set()
-            for address in addresses:
-                results.update(
-                    cast(
-                        Set[UUID],
-                        self.db.users.get_row_by_index_column("address", address),
-                    )
-                )
-            return results & self._items()
+        def new_items() -> AbstractSet[UUID]:
+            addresses = cast(
+                AbstractSet[UUID],
+                self.db.addresses.get_row_by_index_column("district", district),
+            )
+            items = self._materialize()
+            if (
+                not isinstance(items, KeysView)
+                and len(items) < len(addresses)
+                and not self.db.has_cached_users_in_district(district)
+            ):
+                # Without a cached result, checking the address of the
+                # few users selected so far is cheaper than collecting
+                # every user of the district.
+                rows = self.db.users.rows
+                return {item for item in items if rows[item].address in addresses}
+            return self._restrict(self.db.users_in_district(district))
 
         return type(self)(
             items=new_items,
@@ -224,16 +413,17 @@ class UserQuery(UUIDQuery):
         )
 
     def increase_login_count(self) -> int:
-        items = self._items()
+        items = self._materialize()
+        # login_counter is not indexed, so the rows can be changed in
+        # place without going through Table.update_row.
+        rows = self.db.users.rows
         for user_id in items:
-            user_model = self.db.users[user_id]
-            self.db.users.update_row(
-                id_=user_id, login_counter=user_model.login_counter + 1
-            )
+            user_model = rows[user_id]
+            user_model.login_counter += 1
         return len(items)
 
     def delete(self) -> int:
-        items = self._items()
+        items = list(self._materialize())
         for item in items:
             del self.db.users[item]
         return len(items)
@@ -259,7 +449,10 @@ class UserQuery(UUIDQuery):
 
 class IdQuery(UUIDQuery):
     def __iter__(self) -> Iterator[UUID]:
-        yield from self._items()
+        yield from self._materialize()
+
+    def __contains__(self, id_: object) -> bool:
+        return id_ in self._materialize()
 
 
 class AddressQuery(UUIDQuery):
@@ -268,10 +461,9 @@ class AddressQuery(UUIDQuery):
             yield self.db.addresses[item]
 
     def in_district(self, district: str) -> AddressQuery:
-        def new_items() -> Set[UUID]:
-            return self._items() & self.db.addresses.get_row_by_index_column(
-                "district", district
-            )
+        def new_items() -> AbstractSet[UUID]:
+            ids = self.db.addresses.get_row_by_index_column("district", district)
+            return self._restrict(cast(AbstractSet[UUID], ids))
 
         return type(self)(
             db=self.db,
@@ -46,6 +46,15 @@ class SortedCollectionTests(TestCase):
         tree.remove(2)
         assert list(tree) == [1, 3]
 
+    def test_adding_1_2_3_4_to_tree_and_then_removing_4_yields_tree_with_1_2_3(
+        self,
+    ) -> None:
+        tree: SortedCollection[int] = SortedCollection()
+        for item in [1, 2, 3, 4]:
+            tree.add(item)
+        tree.remove(4)
+        assert list(tree) == [1, 2, 3]
+
     def test_adding_1_to_tree_and_then_removing_two_yields_tree_with_1(
         self,
     ) -> None:
@@ -7,7 +7,7 @@ from in_memory_table.table import Table
 
 
 class TableTests(TestCase):
-    @dataclass
+    @dataclass(slots=True)
     class Model:
         id: UUID = field(default_factory=uuid4)
         x: int = 0
@@ -73,6 +73,29 @@ class TableTests(TestCase):
         self.table.update_row(model.id, x=new_x)
         assert self.table.get_row_by_index_column("x", new_x)
 
+    def test_updating_a_row_with_unchanged_value_keeps_it_in_index(
+        self,
+    ) -> None:
+        model = self.Model(x=1)
+        self.table.add_row(model)
+        self.table.update_row(model.id, x=1)
+        assert self.table.get_row_by_index_column("x", 1) == {model.id}
+
+    def test_updating_an_unknown_column_raises_and_leaves_row_unchanged(
+        self,
+    ) -> None:
+        @dataclass
+        class Model:
+            id: UUID = field(default_factory=uuid4)
+            x: int = 0
+
+        table = Table(cls=Model)
+        model = Model()
+        table.add_row(model)
+        with self.assertRaises(AttributeError):
+            table.update_row(model.id, y=5)
+        assert vars(model) == {"id": model.id, "x": 0}
+
     def test_cannot_retrieve_models_that_where_deleted(self) -> None:
         model = self.Model()
         self.table.add_row(model)
@@ -88,6 +111,53 @@ class TableTests(TestCase):
         self.table.delete_row(model.id)
         assert self.table[other_model.id]
 
+    def test_that_rows_added_in_bulk_can_be_retrieved_by_column_value(
+        self,
+    ) -> None:
+        models = [self.Model(x=x % 2) for x in range(4)]
+        self.table.add_rows(models)
+        assert self.table[models[0].id] == models[0]
+        assert self.table.get_row_by_index_column("x", 1) == {
+            models[1].id,
+            models[3].id,
+        }
+
+    def test_that_adding_rows_in_bulk_with_existing_id_leaves_table_unchanged(
+        self,
+    ) -> None:
+        model = self.Model()
+        self.table.add_row(model)
+        new_model = self.Model()
+        with self.assertRaises(ValueError):
+            self.table.add_rows([new_model, model])
+        assert new_model.id not in self.table
+
+    def test_that_adding_rows_in_bulk_with_duplicate_ids_raises_value_error(
+        self,
+    ) -> None:
+        model = self.Model()
+        with self.assertRaises(ValueError):
+            self.table.add_rows([model, model])
+
+    def test_that_all_items_contains_ids_of_rows_present_in_table(self) -> None:
+        model = self.Model()
+        other_model = self.Model()
+        self.table.add_row(model)
+        self.table.add_row(other_model)
+        self.table.delete_row(model.id)
+        assert set(self.table.all_items) == {other_model.id}
+
+    def test_that_revision_changes_when_table_is_modified(self) -> None:
+        model = self.Model()
+        revisions = [self.table.revision]
+        self.table.add_row(model)
+        revisions.append(self.table.revision)
+        self.table.update_row(model.id, x=1)
+        revisions.append(self.table.revision)
+        self.table.delete_row(model.id)
+        revisions.append(self.table.revision)
+        assert len(set(revisions)) == 4
+
     def test_that_ids_can_be_retrieved_in_order(self) -> None:
         models = [self.Model(x=x) for x in [1, 6, 3, 4, 2, 5, 7]]
         for model in models:
@@ -97,9 +167,34 @@ class TableTests(TestCase):
             self.table.get_rows_sorted_by_column("x")
         )
 
+    def test_that_ids_added_after_retrieval_are_retrieved_in_order(self) -> None:
+        models = [self.Model(x=x) for x in [3, 1]]
+        self.table.add_row(models[0])
+        list(self.table.get_rows_sorted_by_column("x"))
+        self.table.add_row(models[1])
+        assert list(self.table.get_rows_sorted_by_column("x")) == [
+            models[1].id,
+            models[0].id,
+        ]
+        assert list(self.table.get_rows_sorted_by_column("x", reverse=True)) == [
+            models[0].id,
+            models[1].id,
+        ]
+
+    def test_that_deleted_ids_are_not_retrieved_in_order(self) -> None:
+        models = [self.Model(x=x) for x in [3, 1, 2]]
+        for model in models:
+            self.table.add_row(model)
+        list(self.table.get_rows_sorted_by_column("x"))
+        self.table.delete_row(models[2].id)
+        assert list(self.table.get_rows_sorted_by_column("x")) == [
+            models[1].id,
+            models[0].id,
+        ]
+
 
 class ComplexIdTests(TestCase):
-    @dataclass
+    @dataclass(slots=True)
     class Model:
         id: Tuple[int, str]
         x: int
@@ -4,10 +4,13 @@ tool to asses the performance impact of implementation details.
 
 from __future__ import annotations
 
+import gc
 import random
 import string
-from timeit import timeit
-from typing import Any, Callable
+from collections import deque
+from statistics import median
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable
 from uuid import uuid4
 
 from .test_database import Database
@@ -17,14 +20,36 @@ def print_timing(
     label: str,
     function: Callable[[], None],
 ) -> None:
-    result = timeit(function, number=100)
-    print(label, result * 10000, "\u03BCs")
+    """Print the median time per call over 5 batches of 100 calls.
+    The function is warmed up first and the garbage collector is
+    disabled while measuring.
+    """
+    for _ in range(10):
+        function()
+    batches = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(5):
+            start = perf_counter_ns()
+            for _ in range(100):
+                function()
+            batches.append(perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    print(label, median(batches) / 100 / 1000, "\u03BCs")
 
 
 def null(o: Any) -> None:
     pass
 
 
+def consume(iterable: Iterable[Any]) -> None:
+    """Exhaust iterable without keeping its items."""
+    deque(iterable, maxlen=0)
+
+
 def random_string():
     return "".join(random.choice(string.ascii_letters) for _ in range(10))
 
@@ -36,28 +61,29 @@ def main() -> None:
     names = list(random_string() for _ in range(100))
     streets = list(random_string() for _ in range(100))
     districts = list(random_string() for _ in range(100))
-    for _ in range(n):
-        street = random.choice(streets)
-        district = random.choice(districts)
-        db.create_address(street=street, district=district)
-    addresses = list(db.get_addresses())
+    addresses = db.create_addresses(
+        zip(random.choices(streets, k=n), random.choices(districts, k=n))
+    )
     print(f"created {n} addresses")
     example_district = random.choice(districts)
-    for _ in range(n):
-        name = random.choice(names)
-        db.create_user(name=name, address=random.choice(addresses).id)
+    db.create_users(
+        zip(
+            random.choices(names, k=n),
+            (address.id for address in random.choices(addresses, k=n)),
+        )
+    )
     print(f"created {n} users")
     print_timing(
         "address.with_id (non-existing)",
-        lambda: null(list(db.get_addresses().with_id(uuid4()))),
+        lambda: consume(db.get_addresses().with_id(uuid4())),
     )
     print_timing(
         "address.in_district",
-        lambda: null(list(db.get_addresses().in_district(example_district))),
+        lambda: consume(db.get_addresses().in_district(example_district)),
     )
     print_timing(
         "user.from_district",
-        lambda: null(list(db.get_users().from_district(example_district))),
+        lambda: consume(db.get_users().from_district(example_district)),
     )
     print_timing(
         "user.increase_login_count",
@@ -67,12 +93,12 @@ def main() -> None:
     query = db.get_users().from_district(example_district).ordered_by_name()
     print_timing(
         f"user.from_district.ordered_by_name len={len(query)}",
-        lambda: null(list(query)),
+        lambda: consume(query),
     )
     query = db.get_users().ordered_by_name().from_district(example_district)
     print_timing(
         f"user.ordered_by_name.from_district len={len(query)}",
-        lambda: null(list(query)),
+        lambda: consume(query),
     )
 
 